@@ -5,20 +5,34 @@ Entry point for the Chess UCI MCP server.
 This module provides the main CLI interface for starting and configuring the server.
 """
 
+import argparse
 import asyncio
 import logging
+import os
 import sys
-
-import click
-
-from chess_uci_mcp.server import ChessUCIBridge
+from typing import Any, Callable, Coroutine, Optional
 
 logger = logging.getLogger("chess_uci_mcp")
 
 
-async def run_bridge(engine_path: str, uci_options: dict[str, str], think_time: int) -> None:
+async def run_bridge(
+    engine_path: str,
+    uci_options: dict[str, str],
+    think_time: int,
+    analysis_cache_size: Optional[int] = None,
+    pool_size: Optional[int] = None,
+) -> None:
     """Asynchronously run and manage the ChessUCIBridge."""
-    bridge = ChessUCIBridge(engine_path, think_time=think_time, options=uci_options)
+    # Imported here so that `--help` and argument errors don't pay for loading mcp and python-chess
+    from chess_uci_mcp.server import ChessUCIBridge
+
+    bridge = ChessUCIBridge(
+        engine_path,
+        uci_options,
+        think_time=think_time,
+        analysis_cache_size=analysis_cache_size,
+        pool_size=pool_size,
+    )
     try:
         await bridge.start()
     except KeyboardInterrupt:
@@ -28,29 +42,89 @@ async def run_bridge(engine_path: str, uci_options: dict[str, str], think_time:
         await bridge.stop()
 
 
-@click.command()
-@click.argument("engine_path", type=click.Path(exists=True))
-@click.option(
-    "--uci-option",
-    "-o",
-    multiple=True,
-    type=(str, str),
-    metavar="NAME VALUE",
-    help="Set a UCI option (e.g., -o Threads 4)",
-)
-@click.option("--think-time", default=1000, type=int, help="Default thinking time in ms")
-@click.option("--debug/--no-debug", default=False, help="Enable debug logging")
-def main(
-    engine_path: str,
-    uci_option: list[tuple[str, str]],
-    think_time: int = 1000,
-    debug: bool = False,
-) -> None:
+def _run(coro: Coroutine[Any, Any, None]) -> None:
+    """Run a coroutine to completion, using uvloop's event loop if it is available."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
+
+
+def _int_at_least(minimum: int) -> Callable[[str], int]:
+    """Build a parser for a command-line value that must be an integer of at least minimum."""
+
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected an integer, got '{value}'")
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+
+    return parse
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="chess-uci-mcp",
+        description="Start the Chess UCI MCP server with a specified engine.",
+    )
+    parser.add_argument(
+        "engine_path",
+        metavar="ENGINE_PATH",
+        help="Path to the UCI-compatible chess engine executable",
+    )
+    parser.add_argument(
+        "--uci-option",
+        "-o",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("NAME", "VALUE"),
+        help="Set a UCI option (e.g., -o Threads 4)",
+    )
+    parser.add_argument("--think-time", default=1000, type=int, help="Default thinking time in ms")
+    parser.add_argument(
+        "--analysis-cache-size",
+        type=_int_at_least(0),
+        help="Number of analyzed positions to remember (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=_int_at_least(1),
+        help="Number of engine processes for batch analysis (default: number of CPUs, at most 4)",
+    )
+    parser.add_argument(
+        "--debug",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Enable debug logging",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """
     Start the Chess UCI MCP server with a specified engine.
 
-    ENGINE_PATH is the path to the UCI-compatible chess engine executable.
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
     """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.engine_path):
+        parser.error(f"ENGINE_PATH '{args.engine_path}' does not exist.")
+
+    engine_path: str = args.engine_path
+    think_time: int = args.think_time
+    analysis_cache_size: Optional[int] = args.analysis_cache_size
+    pool_size: Optional[int] = args.pool_size
+    debug: bool = args.debug
+
     # Configure logging
     log_level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(
@@ -61,19 +135,21 @@ def main(
     # Configure root logger
     logging.getLogger().setLevel(log_level)
 
-    # Convert uci_option list of tuples to a dictionary
-    uci_options = dict(uci_option)
+    # Convert uci_option list of pairs to a dictionary
+    uci_options = dict(args.uci_option)
 
     # Output startup information to logs instead of stdout
     logger.info("Starting Chess UCI MCP bridge")
     logger.info("Engine path: %s", engine_path)
     logger.info("Think time: %d ms", think_time)
+    if analysis_cache_size is not None:
+        logger.info("Analysis cache size: %d", analysis_cache_size)
     for name, value in uci_options.items():
         logger.info("UCI Option: %s = %s", name, value)
 
-    # Run the bridge
+    # Run the bridge, on uvloop if it is installed
     try:
-        asyncio.run(run_bridge(engine_path, uci_options, think_time))
+        _run(run_bridge(engine_path, uci_options, think_time, analysis_cache_size, pool_size))
     except Exception:
         logger.exception("Error running bridge")
         sys.exit(1)
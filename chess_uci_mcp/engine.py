@@ -4,33 +4,323 @@ Chess engine wrapper module.
 This module provides functionality to interact with UCI-compatible chess engines.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Any, Optional
+import math
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Optional, Union
 
 import chess.engine
+import chess.polyglot
 
-from chess_uci_mcp.types import ConfigValue, OptionMetadata
+from chess_uci_mcp.types import ConfigValue
 
 logger = logging.getLogger(__name__)
 
+# Default number of positions kept in the per-engine analysis cache
+DEFAULT_ANALYSIS_CACHE_SIZE = 4096
+
+# Hash table size (MB) configured when the user doesn't set "Hash", so the engine's
+# transposition table keeps useful work between requests
+DEFAULT_HASH_MB = 512
+
+# Default number of engine processes used for batch analysis
+DEFAULT_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Extra time allowed per position before a batch analysis is abandoned
+BATCH_TIMEOUT_SLACK_SECONDS = 5.0
+
+# Time allowed per position in a batch searched to a number of nodes or a depth
+# rather than for a thinking time, before the batch is abandoned
+BATCH_POSITION_TIMEOUT_SECONDS = 60.0
+
+# Time allowed for all engines of a pool to start
+DEFAULT_STARTUP_TIMEOUT_SECONDS = 60.0
+
+# Parts of the engine's info lines used in analysis results (depth is among the basic info);
+# python-chess skips parsing the rest, e.g. currmove, refutation and currline
+_ANALYSIS_INFO = chess.engine.INFO_BASIC | chess.engine.INFO_SCORE | chess.engine.INFO_PV
+
+
+def board_from_fen(fen: str) -> chess.Board:
+    """
+    Parse a FEN string into a board.
+
+    Recently parsed positions are cached; each call returns a fresh copy that
+    the caller is free to modify.
+
+    Args:
+        fen: FEN string representation of the position
+
+    Returns:
+        Board set up in the given position
+
+    Raises:
+        ValueError: If the FEN string is invalid
+    """
+    return _parse_fen(fen).copy()
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_fen(fen: str) -> chess.Board:
+    """Parse a FEN string; the result is shared and must not be modified."""
+    return chess.Board(fen)
+
+
+async def _gather_fail_fast(awaitables: Iterable[Awaitable[Any]], timeout: float, what: str) -> None:
+    """
+    Run awaitables concurrently, cancelling all of them as soon as one fails or time runs out.
+
+    Args:
+        awaitables: Awaitables to run
+        timeout: Time limit in seconds
+        what: Description of the work, for the timeout error message
+
+    Raises:
+        asyncio.TimeoutError: If they don't all finish within the timeout
+        Exception: The first error raised by any of them
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    if not tasks:
+        return
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    for task in done:
+        error = None if task.cancelled() else task.exception()
+        if error is not None:
+            raise error
+    if pending:
+        raise asyncio.TimeoutError(f"{what} timed out after {timeout:.1f}s")
+
+
+# Checks a value for one particular option, returning an error message or None if the value is valid
+_Validator = Callable[[ConfigValue], Optional[str]]
+
+
+def _accept_any(value: ConfigValue) -> Optional[str]:
+    """Accept any value, e.g. for 'button' options, which trigger an action and don't keep a value."""
+    return None
+
+
+def _check_validator(option: chess.engine.Option) -> _Validator:
+    """Build the validator for a 'check' option."""
+
+    def validate(value: ConfigValue) -> Optional[str]:
+        if not isinstance(value, bool):
+            return f"Expected boolean value for check option, got {type(value).__name__}"
+        return None
+
+    return validate
+
+
+def _spin_validator(option: chess.engine.Option) -> _Validator:
+    """Build the validator for a 'spin' option."""
+    minimum, maximum = option.min, option.max
+
+    def validate(value: ConfigValue) -> Optional[str]:
+        if not isinstance(value, int):
+            return f"Expected integer value for spin option, got {type(value).__name__}"
+        if minimum is not None and value < minimum:
+            return f"Value {value} is below minimum {minimum}"
+        if maximum is not None and value > maximum:
+            return f"Value {value} is above maximum {maximum}"
+        return None
+
+    return validate
+
+
+def _combo_validator(option: chess.engine.Option) -> _Validator:
+    """Build the validator for a 'combo' option."""
+    if not option.var:
+        return _accept_any
+    var = option.var
+    allowed = frozenset(var)
+
+    def validate(value: ConfigValue) -> Optional[str]:
+        if not isinstance(value, str) or value not in allowed:
+            return f"Value '{value}' not in allowed values: {var}"
+        return None
+
+    return validate
+
+
+def _string_validator(option: chess.engine.Option) -> _Validator:
+    """Build the validator for a 'string' option."""
+
+    def validate(value: ConfigValue) -> Optional[str]:
+        if not isinstance(value, (str, type(None))):
+            return f"Expected string value for string option, got {type(value).__name__}"
+        return None
+
+    return validate
+
+
+# Option type -> function building the validator for an option of that type;
+# other types (e.g. 'button') accept any value
+_VALIDATOR_FACTORIES: dict[str, Callable[[chess.engine.Option], _Validator]] = {
+    "check": _check_validator,
+    "spin": _spin_validator,
+    "combo": _combo_validator,
+    "string": _string_validator,
+}
+
+
+def _build_validator(option: chess.engine.Option) -> _Validator:
+    """Build the validator for an option; types without a known validator accept any value."""
+    factory = _VALIDATOR_FACTORIES.get(option.type)
+    return factory(option) if factory else _accept_any
+
+
+@dataclass(frozen=True, slots=True)
+class _SearchLimit:
+    """How long a search runs: for a thinking time in ms, a number of nodes, or to a depth."""
+
+    kind: str  # 'time', 'nodes' or 'depth'
+    amount: int
+
+    @classmethod
+    def select(cls, time_ms: int, nodes: Optional[int], depth: Optional[int]) -> "_SearchLimit":
+        """
+        Pick the limit for a search; nodes or depth take precedence over thinking time.
+
+        Raises:
+            ValueError: If both nodes and depth are given, or either is below 1
+        """
+        if nodes is not None and depth is not None:
+            raise ValueError("Specify at most one of nodes and depth")
+        if depth is not None and depth < 1:
+            raise ValueError(f"Depth must be at least 1, got {depth}")
+        if nodes is not None and nodes < 1:
+            raise ValueError(f"Nodes must be at least 1, got {nodes}")
+        if depth is not None:
+            return cls("depth", depth)
+        if nodes is not None:
+            return cls("nodes", nodes)
+        return cls("time", time_ms)
+
+    def covers(self, other: "_SearchLimit") -> bool:
+        """Whether a search with this limit is at least as thorough as one with the other."""
+        return self.kind == other.kind and self.amount >= other.amount
+
+    def to_engine_limit(self) -> chess.engine.Limit:
+        """Convert to a python-chess search limit."""
+        if self.kind == "time":
+            return chess.engine.Limit(time=self.amount / 1000)
+        if self.kind == "nodes":
+            return chess.engine.Limit(nodes=self.amount)
+        return chess.engine.Limit(depth=self.amount)
+
+
+@dataclass(frozen=True, slots=True)
+class _Analysis:
+    """The outcome of a search; immutable, as it is cached and shared between requests."""
+
+    depth: int
+    score: Optional[Any]
+    pv: tuple[str, ...]
+
+    @property
+    def best_move(self) -> Optional[str]:
+        """The first move of the principal variation, if any."""
+        return self.pv[0] if self.pv else None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Build an analysis result that the caller is free to modify."""
+        return {"depth": self.depth, "score": self.score, "pv": list(self.pv), "best_move": self.best_move}
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """A cached analysis and the search limit it was computed with."""
+
+    analysis: _Analysis
+    limit: _SearchLimit
+
+
+@dataclass(slots=True)
+class _Flight:
+    """An analysis in progress and the number of requests waiting for its result."""
+
+    search: asyncio.Future[_Analysis]
+    waiters: int = 0
+
 
 class UCIEngine:
     """A wrapper for UCI chess engines using python-chess."""
 
-    def __init__(self, engine_path: str, options: Optional[dict[str, Any]] = None):
+    # All attributes are initialized in __init__
+    __slots__ = (
+        "engine_path",
+        "options",
+        "analysis_cache_size",
+        "default_hash_mb",
+        "transport",
+        "engine",
+        "_ready",
+        "_current_option_values",
+        "_current_option_values_view",
+        "_engine_id",
+        "_options_cache",
+        "_validators",
+        "_analysis_cache",
+        "_inflight",
+        "_search_lock",
+        "_root",
+        "_board",
+        "_current_moves",
+    )
+
+    def __init__(
+        self,
+        engine_path: str,
+        options: Optional[dict[str, Any]] = None,
+        analysis_cache_size: int = DEFAULT_ANALYSIS_CACHE_SIZE,
+        default_hash_mb: Optional[int] = DEFAULT_HASH_MB,
+    ):
         """
         Initialize UCI engine wrapper.
 
         Args:
             engine_path: Path to the UCI engine executable
             options: Dictionary of engine options to set
+            analysis_cache_size: Maximum number of analyzed positions to remember (0 disables caching)
+            default_hash_mb: Hash size to configure unless "Hash" is among the options
+                (capped at the engine's maximum; None keeps the engine's default)
         """
         self.engine_path = engine_path
         self.options = options or {}
+        self.analysis_cache_size = analysis_cache_size
+        self.default_hash_mb = default_hash_mb
         self.transport = None
         self.engine = None
         self._ready = False
         self._current_option_values: dict[str, ConfigValue] = {}
+        # Read-only view handed out to callers; reflects later changes to the values
+        self._current_option_values_view: Mapping[str, ConfigValue] = MappingProxyType(self._current_option_values)
+        # Engine id and option metadata don't change while the engine runs; built once in start()
+        self._engine_id: Optional[Mapping[str, str]] = None
+        self._options_cache: Optional[Mapping[str, Mapping[str, Any]]] = None
+        # Option name (case-insensitive, like the engine's options) -> validator for its values
+        self._validators: chess.engine.UciOptionMap[_Validator] = chess.engine.UciOptionMap()
+        # Zobrist hash of the position -> cached analysis, least recently used first
+        self._analysis_cache: OrderedDict[int, _CacheEntry] = OrderedDict()
+        # Analyses being computed, by position and search limit
+        self._inflight: dict[tuple[int, _SearchLimit], _Flight] = {}
+        # Serializes searches: python-chess cancels a running command when another one is sent
+        self._search_lock = asyncio.Lock()
+        # Position set by set_position: the starting board, and that board with the moves applied
+        self._root: Optional[chess.Board] = None
+        self._board: Optional[chess.Board] = None
+        self._current_moves: list[str] = []
 
     async def start(self) -> None:
         """
@@ -45,19 +335,55 @@ class UCIEngine:
             self.transport, self.engine = await chess.engine.popen_uci(self.engine_path)
 
             # Configure engine options
-            if self.options:
-                supported_options = self.engine.options
-                configurable_options = {}
-                for name, value in self.options.items():
-                    if name in supported_options:
-                        configurable_options[name] = value
-                        logger.info("Setting engine option: %s = %s", name, value)
-                    else:
-                        logger.warning("Engine does not support option '%s'. Ignoring.", name)
-
-                if configurable_options:
-                    await self.engine.configure(configurable_options)
-                    self._current_option_values.update(configurable_options)
+            supported_options = self.engine.options
+            configurable_options = {}
+            for name, value in self.options.items():
+                if name in supported_options:
+                    configurable_options[name] = value
+                    logger.info("Setting engine option: %s = %s", name, value)
+                else:
+                    logger.warning("Engine does not support option '%s'. Ignoring.", name)
+
+            # A larger hash table lets the engine reuse its search results across requests.
+            # Option names are case-insensitive, so e.g. a user-set "hash" counts as set.
+            if (
+                self.default_hash_mb is not None
+                and "Hash" in supported_options
+                and "Hash" not in chess.engine.UciOptionMap(self.options)
+            ):
+                hash_option = supported_options["Hash"]
+                hash_mb = self.default_hash_mb
+                if hash_option.max is not None:
+                    hash_mb = min(hash_mb, hash_option.max)
+                if hash_option.default is None or hash_mb > hash_option.default:
+                    configurable_options["Hash"] = hash_mb
+                    logger.info("Setting engine option: Hash = %s (default)", hash_mb)
+
+            if configurable_options:
+                await self.engine.configure(configurable_options)
+                self._current_option_values.update(configurable_options)
+
+            self._engine_id = MappingProxyType(dict(self.engine.id))
+            # Read-only throughout (the combo values are a tuple), as callers share these objects
+            self._options_cache = MappingProxyType(
+                {
+                    name: MappingProxyType(
+                        {
+                            "name": option.name,
+                            "type": option.type,
+                            "default": option.default,
+                            "min": option.min,
+                            "max": option.max,
+                            "var": tuple(option.var) if option.var else None,
+                        }
+                    )
+                    for name, option in self.engine.options.items()
+                }
+            )
+            self._validators = chess.engine.UciOptionMap(
+                (name, _build_validator(option))
+                for name, option in self.engine.options.items()
+            )
 
             self._ready = True
             logger.info("Engine %s started and ready", self.engine_path)
@@ -82,100 +408,314 @@ class UCIEngine:
                 self.engine = None
                 self._ready = False
 
-    async def analyze_position(self, fen: str, time_ms: int = 1000) -> dict[str, Any]:
+    async def analyze_position(
+        self,
+        fen: Union[str, chess.Board],
+        time_ms: int = 1000,
+        nodes: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> dict[str, Any]:
         """
         Analyze a chess position and return the best move and evaluation.
 
+        The search is limited by nodes or depth if one of them is given, and by time_ms
+        otherwise. Results are cached per position; a cached analysis is reused when it
+        was computed with the same kind of limit and at least as much time, nodes or depth.
+        Concurrent requests for the same position and limit share a single search.
+
         Args:
-            fen: FEN string representation of the position
+            fen: FEN string representation of the position, or an already parsed board
             time_ms: Time to think in milliseconds
+            nodes: Number of nodes to search
+            depth: Depth to search to
 
         Returns:
             Dictionary containing analysis results
 
         Raises:
             RuntimeError: If the engine is not started
+            ValueError: If both nodes and depth are given, or either is below 1
         """
         if not self.engine or not self._ready:
             raise RuntimeError("Engine not started")
 
+        search_limit = _SearchLimit.select(time_ms, nodes, depth)
+
         # Create a board from the FEN string
-        board = chess.Board(fen)
+        board = board_from_fen(fen) if isinstance(fen, str) else fen
+        # The Zobrist hash ignores the move clocks, so transposed positions share an entry
+        key = chess.polyglot.zobrist_hash(board)
+
+        # Identical requests arriving while a search is running share its result. The search
+        # runs in its own task, so a caller that is cancelled doesn't cancel it for the others;
+        # it is only cancelled once no caller is waiting for it anymore.
+        flight_key = (key, search_limit)
+        flight = self._inflight.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._search_analysis(board, key, search_limit)))
+            self._inflight[flight_key] = flight
+            flight.search.add_done_callback(functools.partial(self._finish_flight, flight_key, flight))
+        else:
+            logger.debug("Joining in-flight analysis: %016x", key)
+
+        flight.waiters += 1
+        try:
+            analysis = await asyncio.shield(flight.search)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.search.done():
+                # Nobody can join a search that is being cancelled
+                self._forget_flight(flight_key, flight)
+                flight.search.cancel()
+        # Each caller gets its own copy of the shared analysis
+        return analysis.to_dict()
+
+    def _forget_flight(self, flight_key: tuple[int, _SearchLimit], flight: _Flight) -> None:
+        """
+        Stop sharing an in-flight analysis with new requests.
 
-        # Set time limit for analysis
-        limit = chess.engine.Limit(time=time_ms / 1000)
+        Args:
+            flight_key: Zobrist hash and search limit the analysis was started for
+            flight: The in-flight analysis
+        """
+        if self._inflight.get(flight_key) is flight:
+            del self._inflight[flight_key]
+
+    def _finish_flight(
+        self, flight_key: tuple[int, _SearchLimit], flight: _Flight, search: asyncio.Future[_Analysis]
+    ) -> None:
+        """
+        Forget a finished in-flight analysis.
+
+        Args:
+            flight_key: Zobrist hash and search limit the analysis was started for
+            flight: The in-flight analysis
+            search: The finished analysis task
+        """
+        self._forget_flight(flight_key, flight)
+        # Mark an error as retrieved, in case every caller was cancelled before it was raised
+        if not search.cancelled():
+            search.exception()
+
+    async def _search_analysis(self, board: chess.Board, key: int, limit: _SearchLimit) -> _Analysis:
+        """
+        Analyze a position, unless a cached analysis is at least as deep as requested.
+
+        Positions with move history bypass the cache: the engine takes repetitions
+        into account, which the cache key does not.
+
+        Args:
+            board: Position to analyze
+            key: Zobrist hash of the position
+            limit: Search limit
+
+        Returns:
+            Analysis of the position
+        """
+        use_cache = not board.move_stack
+        async with self._search_lock:
+            cached = self._get_cached_analysis(key, limit) if use_cache else None
+            if cached is not None:
+                logger.debug("Analysis cache hit: %016x", key)
+                return cached
+
+            # Run analysis
+            info = await self.engine.analyse(board, limit.to_engine_limit(), info=_ANALYSIS_INFO)
+
+            analysis = _Analysis(
+                depth=info.get("depth", 0),
+                score=self._format_score(info.get("score")),
+                pv=tuple(move.uci() for move in info.get("pv", ())),
+            )
+
+            if use_cache:
+                self._store_analysis(key, limit, analysis)
+
+        return analysis
+
+    async def analyze_game(
+        self,
+        fen: Optional[Union[str, chess.Board]] = None,
+        moves: Optional[list[str]] = None,
+        time_ms: int = 1000,
+        nodes: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze every position of a game, one move after the other.
+
+        The positions are analyzed in order on a single board that the moves are
+        played on, so the engine sees each position as the previous one plus a move
+        and can reuse what it found in its hash table. Only the starting position's
+        result is cached, as the later positions depend on the moves leading to them.
+
+        Args:
+            fen: FEN string or an already parsed board of the starting position
+                (if None, uses the standard starting position)
+            moves: Moves of the game in UCI format
+            time_ms: Time to think per position in milliseconds
+            nodes: Number of nodes to search per position
+            depth: Depth to search each position to
+
+        Returns:
+            Analysis results for the starting position and the position after each move
+
+        Raises:
+            RuntimeError: If the engine is not started
+            ValueError: If a move is invalid or illegal, or nodes or depth are invalid
+        """
+        if not self.engine or not self._ready:
+            raise RuntimeError("Engine not started")
+
+        search_limit = _SearchLimit.select(time_ms, nodes, depth)
+
+        if isinstance(fen, str):
+            board = board_from_fen(fen)
+        else:
+            board = fen.copy() if fen is not None else chess.Board()
+
+        # Check all moves before spending any engine time
+        replay = board.copy()
+        game_moves = [replay.push_uci(move_uci) for move_uci in moves or []]
+
+        analyses = [await self._search_analysis(board, chess.polyglot.zobrist_hash(board), search_limit)]
+        for move in game_moves:
+            board.push(move)
+            analyses.append(await self._search_analysis(board, chess.polyglot.zobrist_hash(board), search_limit))
+        return [analysis.to_dict() for analysis in analyses]
+
+    def _get_cached_analysis(self, key: int, limit: _SearchLimit) -> Optional[_Analysis]:
+        """
+        Look up a cached analysis that is at least as deep as requested.
+
+        Args:
+            key: Zobrist hash of the position
+            limit: Requested search limit
 
-        # Run analysis
-        info = await self.engine.analyse(board, limit)
+        Returns:
+            Cached analysis, or None on a miss
+        """
+        entry = self._analysis_cache.get(key)
+        if entry is None or not entry.limit.covers(limit):
+            return None
+        self._analysis_cache.move_to_end(key)
+        return entry.analysis
 
-        # Format the result
-        result = {
-            "depth": info.get("depth", 0),
-            "score": self._format_score(info.get("score")),
-            "pv": [move.uci() for move in info.get("pv", [])],
-            "best_move": info.get("pv", [None])[0].uci() if info.get("pv") else None,
-        }
+    def _store_analysis(self, key: int, limit: _SearchLimit, analysis: _Analysis) -> None:
+        """
+        Store an analysis, evicting the least recently used entries.
 
-        return result
+        Args:
+            key: Zobrist hash of the position
+            limit: Search limit the analysis was computed with
+            analysis: Analysis of the position
+        """
+        if self.analysis_cache_size <= 0:
+            return
+        self._analysis_cache[key] = _CacheEntry(analysis, limit)
+        self._analysis_cache.move_to_end(key)
+        while len(self._analysis_cache) > self.analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
 
     async def set_position(
-        self, fen: Optional[str] = None, moves: Optional[list[str]] = None
+        self, fen: Optional[Union[str, chess.Board]] = None, moves: Optional[list[str]] = None
     ) -> None:
         """
         Set a position on the engine's internal board.
 
+        When the starting position is unchanged and the new moves extend (or share a
+        prefix with) the previous ones, only the differing moves are taken back or
+        played, so following a game move by move stays cheap.
+
         Args:
-            fen: FEN string (if None, uses starting position)
+            fen: FEN string or an already parsed board (if None, uses starting position)
             moves: List of moves in UCI format
 
         Raises:
             RuntimeError: If the engine is not started
+            ValueError: If a move is invalid or illegal; the previous position is kept
         """
         if not self.engine or not self._ready:
             raise RuntimeError("Engine not started")
 
-        # This method doesn't do anything directly with python-chess
-        # as the engine state is managed internally by the chess.engine module.
-        # Position will be set when get_best_move or analyze_position is called.
-
-        # Store the position information for later use
-        self._current_fen = fen
-        self._current_moves = moves or []
+        # This method doesn't send anything to the engine directly;
+        # the position is passed along when get_best_move is called.
+        if isinstance(fen, str):
+            root = board_from_fen(fen)
+        else:
+            root = fen.copy(stack=False) if fen is not None else chess.Board()
+        moves = list(moves or [])
+
+        # Don't touch the board while a search on it is running
+        async with self._search_lock:
+            common = 0
+            if self._board is not None and root == self._root:
+                board = self._board
+                # Length of the common prefix with the previously applied moves
+                for old_move, new_move in zip(self._current_moves, moves):
+                    if old_move != new_move:
+                        break
+                    common += 1
+                taken_back = [board.pop() for _ in range(len(self._current_moves) - common)]
+            else:
+                board = root.copy()
+                taken_back = []
+
+            pushed = 0
+            try:
+                for move_uci in moves[common:]:
+                    board.push_uci(move_uci)
+                    pushed += 1
+            except ValueError:
+                # Keep the previous position rather than a half-applied one
+                for _ in range(pushed):
+                    board.pop()
+                for move in reversed(taken_back):
+                    board.push(move)
+                raise
+            if board is not self._board:
+                self._root, self._board = root, board
+            self._current_moves = moves
         logger.debug("Position set: FEN=%s, Moves=%s", fen or "startpos", moves)
 
-    async def get_best_move(self, time_ms: int = 1000) -> str:
+    async def get_best_move(
+        self, time_ms: int = 1000, nodes: Optional[int] = None, depth: Optional[int] = None
+    ) -> str:
         """
         Calculate the best move from the current position.
 
+        The search is limited by nodes or depth if one of them is given, and by time_ms otherwise.
+
         Args:
             time_ms: Time to think in milliseconds
+            nodes: Number of nodes to search
+            depth: Depth to search to
 
         Returns:
             Best move in UCI format (e.g., "e2e4")
 
         Raises:
             RuntimeError: If the engine is not started
+            ValueError: If both nodes and depth are given, or either is below 1
         """
         if not self.engine or not self._ready:
             raise RuntimeError("Engine not started")
 
-        # Create a board
-        board = (
-            chess.Board(self._current_fen)
-            if hasattr(self, "_current_fen") and self._current_fen
-            else chess.Board()
-        )
+        search_limit = _SearchLimit.select(time_ms, nodes, depth)
 
-        # Apply moves if any
-        if hasattr(self, "_current_moves") and self._current_moves:
-            for move_uci in self._current_moves:
-                board.push_uci(move_uci)
+        async with self._search_lock:
+            # The engine doesn't modify the board, so the current one is used as is
+            board = self._board if self._board is not None else chess.Board()
 
-        # Set time limit
-        limit = chess.engine.Limit(time=time_ms / 1000)
+            # Reuse a cached analysis unless there is move history: the engine
+            # takes repetitions into account, which the cache key does not
+            if not board.move_stack:
+                cached = self._get_cached_analysis(chess.polyglot.zobrist_hash(board), search_limit)
+                if cached is not None and cached.best_move:
+                    return cached.best_move
 
-        # Get best move
-        result = await self.engine.play(board, limit)
+            # Get best move
+            result = await self.engine.play(board, search_limit.to_engine_limit())
 
         # Return the move in UCI format
         return result.move.uci() if result.move else ""
@@ -196,57 +736,44 @@ class UCIEngine:
         # Get score from white's perspective
         white_score = score.white()
 
-        # Check if it's a mate score
-        if white_score.is_mate():
-            mate_in = white_score.mate()
-            return f"mate{mate_in}" if mate_in is not None else None
+        # Return centipawn score as a float; mate scores have no centipawn value
+        centipawns = white_score.score()
+        if centipawns is not None:
+            return centipawns / 100.0
 
-        # Return centipawn score as a float
-        if white_score.score() is not None:
-            return white_score.score() / 100.0
+        mate_in = white_score.mate()
+        return f"mate{mate_in}" if mate_in is not None else None
 
-        return None
-
-    def get_engine_id(self) -> dict[str, str]:
+    def get_engine_id(self) -> Mapping[str, str]:
         """
         Get the engine identification info.
 
         Returns:
-            Dictionary with engine ID info (typically 'name', 'author')
+            Read-only mapping with engine ID info (typically 'name', 'author')
 
         Raises:
             RuntimeError: If the engine is not started
         """
         if not self.engine or not self._ready:
             raise RuntimeError("Engine not started")
-        return dict(self.engine.id)
+        return self._engine_id
 
-    def get_available_options(self) -> dict[str, OptionMetadata]:
+    def get_available_options(self) -> Mapping[str, Mapping[str, Any]]:
         """
         Get all available UCI options with their metadata.
 
         Returns:
-            Dictionary mapping option names to their metadata
+            Read-only mapping of option names to their metadata: read-only mappings
+            with the keys of OptionMetadata, where the allowed combo values are a tuple
 
         Raises:
             RuntimeError: If the engine is not started
         """
         if not self.engine or not self._ready:
             raise RuntimeError("Engine not started")
+        return self._options_cache
 
-        options: dict[str, OptionMetadata] = {}
-        for name, option in self.engine.options.items():
-            options[name] = {
-                "name": option.name,
-                "type": option.type,
-                "default": option.default,
-                "min": option.min,
-                "max": option.max,
-                "var": list(option.var) if option.var else None,
-            }
-        return options
-
-    def get_current_option_values(self) -> dict[str, ConfigValue]:
+    def get_current_option_values(self) -> Mapping[str, ConfigValue]:
         """
         Get current values for all configured options.
 
@@ -254,9 +781,10 @@ class UCIEngine:
         use their defaults (available in option metadata).
 
         Returns:
-            Dictionary mapping option names to their current values
+            Read-only mapping of option names to their current values; it reflects
+            options set later on
         """
-        return dict(self._current_option_values)
+        return self._current_option_values_view
 
     async def set_options(
         self, options: dict[str, ConfigValue]
@@ -278,16 +806,16 @@ class UCIEngine:
 
         applied: dict[str, ConfigValue] = {}
         errors: dict[str, str] = {}
-        supported_options = self.engine.options
+        validators = self._validators
 
         for name, value in options.items():
-            if name not in supported_options:
+            validator = validators.get(name)
+            if validator is None:
                 errors[name] = f"Option '{name}' is not supported by this engine"
                 continue
 
-            # Validate the value based on option type
-            option_meta = supported_options[name]
-            validation_error = self._validate_option_value(option_meta, value)
+            # Validate the value against the option's type and limits
+            validation_error = validator(value)
             if validation_error:
                 errors[name] = validation_error
                 continue
@@ -295,40 +823,125 @@ class UCIEngine:
             applied[name] = value
 
         if applied:
-            await self.engine.configure(applied)
-            self._current_option_values.update(applied)
+            # Sending a command cancels a running search, so wait for it to finish first
+            async with self._search_lock:
+                await self.engine.configure(applied)
+                self._current_option_values.update(applied)
+                # Cached evaluations may no longer match the engine's configuration
+                self._analysis_cache.clear()
             for name, value in applied.items():
                 logger.info("Set engine option: %s = %s", name, value)
 
         return applied, errors
 
-    def _validate_option_value(self, option: Any, value: ConfigValue) -> Optional[str]:
+
+class UCIEnginePool:
+    """A fixed set of single-threaded UCI engines that analyze positions in parallel."""
+
+    def __init__(
+        self,
+        engine_path: str,
+        size: int = DEFAULT_POOL_SIZE,
+        options: Optional[dict[str, Any]] = None,
+        analysis_cache_size: int = DEFAULT_ANALYSIS_CACHE_SIZE,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the engine pool.
+
+        Args:
+            engine_path: Path to the UCI engine executable
+            size: Number of engine processes
+            options: Dictionary of engine options to set on every engine ("Threads" is forced to 1)
+            analysis_cache_size: Maximum number of analyzed positions each engine remembers
+            startup_timeout: Time in seconds allowed for all engines to start
+        """
+        if size < 1:
+            raise ValueError(f"Engine pool size must be positive, got {size}")
+        self.startup_timeout = startup_timeout
+        # The pool parallelizes across processes, so each engine gets a single search thread.
+        # They also keep the engine's default hash size rather than each claiming DEFAULT_HASH_MB.
+        engine_options = {**(options or {}), "Threads": 1}
+        self.engines = [
+            UCIEngine(engine_path, engine_options, analysis_cache_size, default_hash_mb=None) for _ in range(size)
+        ]
+
+    async def start(self) -> None:
+        """
+        Start all engine processes concurrently.
+
+        Startup takes as long as the slowest engine. If any engine fails or the
+        startup timeout passes, the remaining startups are cancelled and the
+        engines that did start are stopped again.
+
+        Raises:
+            RuntimeError: If an engine fails to start
+            asyncio.TimeoutError: If the engines don't start in time
         """
-        Validate an option value against its constraints.
+        try:
+            await _gather_fail_fast(
+                (engine.start() for engine in self.engines), self.startup_timeout, "Engine pool startup"
+            )
+        except BaseException:
+            await self.stop()
+            raise
+
+    async def stop(self) -> None:
+        """Stop all engine processes; a failure to stop one engine doesn't prevent stopping the others."""
+        await asyncio.gather(*(engine.stop() for engine in self.engines), return_exceptions=True)
+
+    async def analyze_batch(
+        self,
+        fens: list[Union[str, chess.Board]],
+        time_ms: int = 1000,
+        nodes: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze several positions, spreading them across the pool.
+
+        Each position is searched as by UCIEngine.analyze_position: limited by nodes or
+        depth if one of them is given, and by time_ms otherwise.
 
         Args:
-            option: Option object from python-chess
-            value: Value to validate
+            fens: FEN strings (or already parsed boards) of the positions to analyze
+            time_ms: Time to think per position in milliseconds
+            nodes: Number of nodes to search per position
+            depth: Depth to search each position to
 
         Returns:
-            Error message if invalid, None if valid
-        """
-        if option.type == "check":
-            if not isinstance(value, bool):
-                return f"Expected boolean value for check option, got {type(value).__name__}"
-        elif option.type == "spin":
-            if not isinstance(value, int):
-                return f"Expected integer value for spin option, got {type(value).__name__}"
-            if option.min is not None and value < option.min:
-                return f"Value {value} is below minimum {option.min}"
-            if option.max is not None and value > option.max:
-                return f"Value {value} is above maximum {option.max}"
-        elif option.type == "combo":
-            if option.var and value not in option.var:
-                return f"Value '{value}' not in allowed values: {option.var}"
-        elif option.type == "string":
-            if not isinstance(value, (str, type(None))):
-                return f"Expected string value for string option, got {type(value).__name__}"
-        # 'button' type triggers an action, doesn't take a persistent value
+            Analysis results, in the same order as fens
 
-        return None
+        Raises:
+            RuntimeError: If the engines are not started
+            ValueError: If both nodes and depth are given, or either is below 1
+            asyncio.TimeoutError: If the batch takes much longer than its thinking time
+                (or BATCH_POSITION_TIMEOUT_SECONDS per position for node or depth limits)
+        """
+        search_limit = _SearchLimit.select(time_ms, nodes, depth)
+
+        queue: asyncio.Queue[tuple[int, Union[str, chess.Board]]] = asyncio.Queue()
+        for item in enumerate(fens):
+            queue.put_nowait(item)
+        results: list[dict[str, Any]] = [{} for _ in fens]
+
+        async def worker(engine: UCIEngine) -> None:
+            while not queue.empty():
+                index, fen = queue.get_nowait()
+                results[index] = await engine.analyze_position(fen, time_ms, nodes=nodes, depth=depth)
+
+        engines = self.engines[: len(fens)]
+        if not engines:
+            return results
+
+        # How long a search to a number of nodes or a depth takes isn't known in advance
+        if search_limit.kind == "time":
+            position_seconds = time_ms / 1000
+        else:
+            position_seconds = BATCH_POSITION_TIMEOUT_SECONDS
+        rounds = math.ceil(len(fens) / len(engines))
+        timeout = rounds * (position_seconds + BATCH_TIMEOUT_SLACK_SECONDS)
+        await _gather_fail_fast(
+            (worker(engine) for engine in engines), timeout, f"Batch analysis of {len(fens)} positions"
+        )
+        return results
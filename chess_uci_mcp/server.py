@@ -4,17 +4,24 @@ MCP server module for chess engine integration.
 This module implements the MCP server that provides access to UCI chess engines.
 """
 
+import asyncio
 import logging
 from typing import Any, Optional
 
-import chess
 from mcp.server import FastMCP
 
-from chess_uci_mcp.engine import UCIEngine
+from chess_uci_mcp.engine import (
+    DEFAULT_ANALYSIS_CACHE_SIZE,
+    DEFAULT_POOL_SIZE,
+    UCIEngine,
+    UCIEnginePool,
+    board_from_fen,
+)
 from chess_uci_mcp.types import (
     EngineInfo,
     GetEngineOptionsResult,
     OptionInfo,
+    OptionMetadata,
     SetEngineOptionsResult,
 )
 
@@ -24,19 +31,29 @@ logger = logging.getLogger(__name__)
 class ChessUCIBridge:
     """Bridge between MCP and UCI chess engines."""
 
-    def __init__(self, engine_path: str, **options):
+    def __init__(self, engine_path: str, uci_options: Optional[dict[str, Any]] = None, **options):
         """
         Initialize the chess UCI bridge.
 
         Args:
             engine_path: Path to the UCI engine executable
-            options: Engine options (e.g., think_time, Threads, Hash)
+            uci_options: UCI options to set on the engine (e.g., Threads, Hash); kept apart from
+                the bridge settings, so any option name can be used
+            options: Bridge settings (think_time, analysis_cache_size, pool_size); any other
+                keyword is taken as a UCI option as well
         """
         self.engine_path = engine_path
         self.default_think_time = options.pop("think_time", 1000)
-        self.engine_options = options
+        analysis_cache_size = options.pop("analysis_cache_size", None)
+        self.analysis_cache_size = (
+            DEFAULT_ANALYSIS_CACHE_SIZE if analysis_cache_size is None else analysis_cache_size
+        )
+        pool_size = options.pop("pool_size", None)
+        self.pool_size = DEFAULT_POOL_SIZE if pool_size is None else pool_size
+        self.engine_options = {**options, **(uci_options or {})}
 
         self.engine: Optional[UCIEngine] = None
+        self.engine_pool: Optional[UCIEnginePool] = None
         self.mcp = FastMCP("chess-uci")
 
         # Register tools
@@ -46,13 +63,17 @@ class ChessUCIBridge:
         """Register MCP tools for chess engine functions."""
 
         @self.mcp.tool("analyze", description="Analyze a chess position specified by FEN string.")
-        async def analyze(fen: str, time_ms: Optional[int] = None) -> dict[str, Any]:
+        async def analyze(
+            fen: str, time_ms: Optional[int] = None, nodes: Optional[int] = None, depth: Optional[int] = None
+        ) -> dict[str, Any]:
             """
             Analyze a chess position.
 
             Args:
                 fen: FEN string representation of the position
                 time_ms: Time to think in milliseconds (default uses bridge setting)
+                nodes: Number of nodes to search instead of a thinking time
+                depth: Depth to search to instead of a thinking time
 
             Returns:
                 Analysis results
@@ -63,23 +84,107 @@ class ChessUCIBridge:
             # Use default time if not specified
             think_time = time_ms if time_ms is not None else self.default_think_time
 
-            # Validate FEN
+            # Validate FEN; the parsed board is passed on so it isn't parsed twice
             try:
-                chess.Board(fen)
+                board = board_from_fen(fen)
             except ValueError:
                 raise ValueError(f"Invalid FEN string: {fen}")
 
-            result = await self.engine.analyze_position(fen, think_time)
+            result = await self.engine.analyze_position(board, think_time, nodes=nodes, depth=depth)
             return result
 
+        @self.mcp.tool(
+            "analyze_batch",
+            description="Analyze several chess positions (FEN strings) in parallel, e.g. all positions of a game.",
+        )
+        async def analyze_batch(
+            fens: list[str],
+            time_ms: Optional[int] = None,
+            nodes: Optional[int] = None,
+            depth: Optional[int] = None,
+        ) -> list[dict[str, Any]]:
+            """
+            Analyze several chess positions using a pool of engine processes.
+
+            Args:
+                fens: FEN string representations of the positions
+                time_ms: Time to think per position in milliseconds (default uses bridge setting)
+                nodes: Number of nodes to search per position instead of a thinking time
+                depth: Depth to search each position to instead of a thinking time
+
+            Returns:
+                Analysis results, in the same order as fens
+            """
+            # Validate all FENs before spending any engine time
+            boards = []
+            for fen in fens:
+                try:
+                    boards.append(board_from_fen(fen))
+                except ValueError:
+                    raise ValueError(f"Invalid FEN string: {fen}")
+
+            if not self.engine_pool:
+                await self._ensure_pool_started()
+
+            # Use default time if not specified
+            think_time = time_ms if time_ms is not None else self.default_think_time
+
+            return await self.engine_pool.analyze_batch(boards, think_time, nodes=nodes, depth=depth)
+
+        @self.mcp.tool(
+            "analyze_game",
+            description="Analyze every position of a game, given its starting FEN and moves, one move after the other.",
+        )
+        async def analyze_game(
+            moves: list[str],
+            fen: Optional[str] = None,
+            time_ms: Optional[int] = None,
+            nodes: Optional[int] = None,
+            depth: Optional[int] = None,
+        ) -> list[dict[str, Any]]:
+            """
+            Analyze the positions of a game sequentially on one engine.
+
+            Args:
+                moves: Moves of the game in UCI format
+                fen: FEN string of the starting position (if None, uses the standard starting position)
+                time_ms: Time to think per position in milliseconds (default uses bridge setting)
+                nodes: Number of nodes to search per position instead of a thinking time
+                depth: Depth to search each position to instead of a thinking time
+
+            Returns:
+                Analysis results for the starting position and the position after each move
+            """
+            if not self.engine:
+                await self._ensure_engine_started()
+
+            board = None
+            if fen:
+                try:
+                    board = board_from_fen(fen)
+                except ValueError:
+                    raise ValueError(f"Invalid FEN string: {fen}")
+
+            # Use default time if not specified
+            think_time = time_ms if time_ms is not None else self.default_think_time
+
+            return await self.engine.analyze_game(board, moves, think_time, nodes=nodes, depth=depth)
+
         @self.mcp.tool("get_best_move", description="Get the best move for a chess position.")
-        async def get_best_move(fen: Optional[str] = None, time_ms: Optional[int] = None) -> str:
+        async def get_best_move(
+            fen: Optional[str] = None,
+            time_ms: Optional[int] = None,
+            nodes: Optional[int] = None,
+            depth: Optional[int] = None,
+        ) -> str:
             """
             Get best move for current or specified position.
 
             Args:
                 fen: FEN string (optional, if omitted uses current position)
                 time_ms: Time to think in milliseconds (default uses bridge setting)
+                nodes: Number of nodes to search instead of a thinking time
+                depth: Depth to search to instead of a thinking time
 
             Returns:
                 Best move in UCI format (e.g., "e2e4")
@@ -90,15 +195,15 @@ class ChessUCIBridge:
             # Set position if FEN is provided
             if fen:
                 try:
-                    chess.Board(fen)
-                    await self.engine.set_position(fen)
+                    board = board_from_fen(fen)
                 except ValueError:
                     raise ValueError(f"Invalid FEN string: {fen}")
+                await self.engine.set_position(board)
 
             # Use default time if not specified
             think_time = time_ms if time_ms is not None else self.default_think_time
 
-            best_move = await self.engine.get_best_move(think_time)
+            best_move = await self.engine.get_best_move(think_time, nodes=nodes, depth=depth)
             return best_move
 
         @self.mcp.tool("set_position", description="Set the current chess position.")
@@ -119,9 +224,10 @@ class ChessUCIBridge:
                 await self._ensure_engine_started()
 
             # Validate FEN if provided
+            board = None
             if fen:
                 try:
-                    chess.Board(fen)
+                    board = board_from_fen(fen)
                 except ValueError:
                     raise ValueError(f"Invalid FEN string: {fen}")
 
@@ -129,7 +235,7 @@ class ChessUCIBridge:
             if moves and not isinstance(moves, list):
                 raise ValueError("Moves must be a list of strings")
 
-            await self.engine.set_position(fen, moves)
+            await self.engine.set_position(board, moves)
             return {"success": True}
 
         @self.mcp.tool("engine_info", description="Get information about the chess engine.")
@@ -145,7 +251,7 @@ class ChessUCIBridge:
 
             return {
                 "path": self.engine_path,
-                "id": self.engine.get_engine_id(),
+                "id": dict(self.engine.get_engine_id()),
                 "configured_options": self.engine_options,
             }
 
@@ -172,7 +278,8 @@ class ChessUCIBridge:
                 # Current value is either explicitly set or falls back to default
                 current_value = current_values.get(name, metadata["default"])
                 options[name] = {
-                    "metadata": metadata,
+                    # The engine's metadata is a read-only view; the response gets a plain copy
+                    "metadata": OptionMetadata(**metadata),
                     "current_value": current_value,
                 }
 
@@ -214,11 +321,16 @@ class ChessUCIBridge:
     async def _ensure_engine_started(self):
         """Ensure the engine is started."""
         if not self.engine:
-            # Create a copy of options without think_time (it's not a UCI option)
-            engine_options = {k: v for k, v in self.engine_options.items() if k != "think_time"}
-            self.engine = UCIEngine(self.engine_path, engine_options)
+            self.engine = UCIEngine(self.engine_path, self.engine_options, self.analysis_cache_size)
             await self.engine.start()
 
+    async def _ensure_pool_started(self):
+        """Ensure the batch analysis engine pool is started."""
+        if not self.engine_pool:
+            pool = UCIEnginePool(self.engine_path, self.pool_size, self.engine_options, self.analysis_cache_size)
+            await pool.start()
+            self.engine_pool = pool
+
     async def start(self):
         """Start the MCP bridge."""
         logger.info("Starting Chess UCI MCP bridge with engine: %s", self.engine_path)
@@ -233,7 +345,10 @@ class ChessUCIBridge:
         """Stop the MCP bridge."""
         logger.info("Stopping Chess UCI MCP bridge")
 
-        # Stop the engine
-        if self.engine:
-            await self.engine.stop()
-            self.engine = None
+        # Stop the engine and the batch analysis engines
+        engine, self.engine = self.engine, None
+        engine_pool, self.engine_pool = self.engine_pool, None
+        await asyncio.gather(
+            *(component.stop() for component in (engine, engine_pool) if component),
+            return_exceptions=True,
+        )
@@ -1,5 +1,6 @@
 """Type definitions for chess-uci-mcp."""
 
+from collections.abc import Sequence
 from typing import Optional, TypedDict, Union
 
 
@@ -27,7 +28,7 @@ class OptionMetadata(TypedDict):
     default: ConfigValue
     min: Optional[int]  # Only for 'spin' type
     max: Optional[int]  # Only for 'spin' type
-    var: Optional[list[str]]  # Only for 'combo' type
+    var: Optional[Sequence[str]]  # Only for 'combo' type
 
 
 class OptionInfo(TypedDict):
@@ -1,8 +1,11 @@
+import asyncio
 import pytest
 import shutil
+from collections.abc import Mapping
 import chess
-from chess_uci_mcp.engine import UCIEngine
+from chess_uci_mcp.engine import DEFAULT_HASH_MB, UCIEngine, UCIEnginePool
 from typing import Any, Optional, Final
+from unittest.mock import AsyncMock
 
 # We use list[Any] because the return type of pytest.param, `ParameterSet`,
 # is not a public type.
@@ -21,6 +24,12 @@ if not ENGINES:
     pytest.skip("No supported chess engines (stockfish, lc0) found in PATH", allow_module_level=True)
 
 
+def count_searches(engine: UCIEngine) -> AsyncMock:
+    """Wrap python-chess's analyse() of a started engine, so that the searches it runs can be counted."""
+    engine.engine.analyse = AsyncMock(wraps=engine.engine.analyse)
+    return engine.engine.analyse
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("engine_path", ENGINES)
 async def test_uci_engine_wrapper_sanity(engine_path: str) -> None:
@@ -66,8 +75,8 @@ async def test_get_engine_id(engine_path: str) -> None:
     engine: UCIEngine = UCIEngine(engine_path)
     try:
         await engine.start()
-        engine_id: dict[str, str] = engine.get_engine_id()
-        assert isinstance(engine_id, dict)
+        engine_id: Mapping[str, str] = engine.get_engine_id()
+        assert isinstance(engine_id, Mapping)
         # Most UCI engines report at least a name
         assert "name" in engine_id
         assert isinstance(engine_id["name"], str)
@@ -85,7 +94,15 @@ async def test_get_available_options(engine_path: str) -> None:
     try:
         await engine.start()
         options = engine.get_available_options()
-        assert isinstance(options, dict)
+        assert isinstance(options, Mapping)
+        # Built once at startup and shared between calls
+        assert engine.get_available_options() is options
+        # ... so neither the mapping nor the metadata of an option can be modified
+        with pytest.raises(TypeError):
+            options["Hash"] = {}
+        for metadata in options.values():
+            with pytest.raises(TypeError):
+                metadata["default"] = None
 
         # Most engines have at least some options
         assert len(options) > 0
@@ -98,6 +115,25 @@ async def test_get_available_options(engine_path: str) -> None:
             assert hash_opt["min"] is not None
             assert hash_opt["max"] is not None
             assert isinstance(hash_opt["default"], int)
+
+            # Unless set explicitly, Hash is raised to a larger default
+            expected_hash = min(DEFAULT_HASH_MB, hash_opt["max"])
+            if expected_hash > hash_opt["default"]:
+                assert engine.get_current_option_values()["Hash"] == expected_hash
+    finally:
+        if engine._ready:
+            await engine.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine_path", ENGINES)
+async def test_hash_option_case_insensitive(engine_path: str) -> None:
+    """Test that a Hash option given in another case isn't overridden by the default hash size."""
+    engine: UCIEngine = UCIEngine(engine_path, {"hash": 16})
+    try:
+        await engine.start()
+        if "Hash" in engine.get_available_options():
+            assert dict(engine.get_current_option_values()) == {"hash": 16}
     finally:
         if engine._ready:
             await engine.stop()
@@ -116,14 +152,25 @@ async def test_set_options_runtime(engine_path: str) -> None:
         if "Hash" in options:
             hash_opt = options["Hash"]
             min_val = hash_opt["min"] or 1
+            current = engine.get_current_option_values()
             # Set to minimum value to be safe
             applied, errors = await engine.set_options({"Hash": min_val})
             assert "Hash" in applied
             assert len(errors) == 0
 
-            # Verify value is tracked
-            current = engine.get_current_option_values()
+            # Verify value is tracked, also by the previously returned read-only view
             assert current.get("Hash") == min_val
+            assert engine.get_current_option_values() is current
+
+            # Setting options waits for a running search instead of cancelling it
+            search = asyncio.ensure_future(engine.analyze_position(fen=chess.STARTING_FEN, time_ms=500))
+            await asyncio.sleep(0.1)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await engine.set_options({"Hash": min_val})
+            assert loop.time() - started >= 0.3
+            assert not engine._analysis_cache
+            assert (await search)["best_move"] is not None
     finally:
         if engine._ready:
             await engine.stop()
@@ -185,4 +232,197 @@ async def test_set_option_out_of_range(engine_path: str) -> None:
                 assert "above maximum" in errors["Hash"]
     finally:
         if engine._ready:
-            await engine.stop()
\ No newline at end of file
+            await engine.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine_path", ENGINES)
+async def test_analysis_cache(engine_path: str) -> None:
+    """Test that repeated analysis of a position is served from the cache."""
+    engine: UCIEngine = UCIEngine(engine_path)
+    try:
+        await engine.start()
+        searches = count_searches(engine)
+        first = await engine.analyze_position(fen=chess.STARTING_FEN, time_ms=100)
+        assert searches.await_count == 1
+
+        # Same position with different move clocks, requesting less time: cache hit
+        transposed_fen = chess.STARTING_FEN.replace(" 0 1", " 4 3")
+        cached = await engine.analyze_position(fen=transposed_fen, time_ms=50)
+        assert cached == first
+        assert searches.await_count == 1
+
+        # Each caller gets its own copy, so changing it doesn't affect the cache
+        expected = {**first, "pv": list(first["pv"])}
+        cached["pv"].clear()
+        cached["best_move"] = None
+        assert await engine.analyze_position(fen=chess.STARTING_FEN, time_ms=50) == expected
+        assert searches.await_count == 1
+
+        # Requesting more time than was spent: searched again
+        await engine.analyze_position(fen=chess.STARTING_FEN, time_ms=200)
+        assert searches.await_count == 2
+
+        # Depth-limited results are only reused for depth-limited requests
+        by_depth = await engine.analyze_position(fen=chess.STARTING_FEN, depth=6)
+        assert await engine.analyze_position(fen=chess.STARTING_FEN, depth=4) == by_depth
+        assert searches.await_count == 3
+        await engine.analyze_position(fen=chess.STARTING_FEN, nodes=1000)
+        assert searches.await_count == 4
+
+        with pytest.raises(ValueError):
+            await engine.analyze_position(fen=chess.STARTING_FEN, nodes=1000, depth=4)
+        with pytest.raises(ValueError):
+            await engine.analyze_position(fen=chess.STARTING_FEN, depth=-1)
+        with pytest.raises(ValueError):
+            await engine.analyze_position(fen=chess.STARTING_FEN, nodes=0)
+    finally:
+        if engine._ready:
+            await engine.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine_path", ENGINES)
+async def test_concurrent_analysis_shared(engine_path: str) -> None:
+    """Test that concurrent identical analysis requests share one search."""
+    # Without a cache, the second request can only get the same result by joining the first
+    engine: UCIEngine = UCIEngine(engine_path, analysis_cache_size=0)
+    try:
+        await engine.start()
+        searches = count_searches(engine)
+        first, second = await asyncio.gather(
+            engine.analyze_position(fen=chess.STARTING_FEN, time_ms=100),
+            engine.analyze_position(fen=chess.STARTING_FEN, time_ms=100),
+        )
+        assert first == second
+        assert first is not second
+        assert searches.await_count == 1
+        assert not engine._inflight
+
+        # Searched again once the first search is done
+        await engine.analyze_position(fen=chess.STARTING_FEN, time_ms=100)
+        assert searches.await_count == 2
+
+        # Cancelling the request that started a search doesn't cancel it for the others
+        owner = asyncio.ensure_future(engine.analyze_position(fen=chess.STARTING_FEN, time_ms=100))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(engine.analyze_position(fen=chess.STARTING_FEN, time_ms=100))
+        await asyncio.sleep(0)
+        owner.cancel()
+        assert (await joiner)["best_move"] is not None
+        assert owner.cancelled()
+
+        # A search nobody waits for anymore is stopped, so it doesn't hold up later requests
+        abandoned = asyncio.ensure_future(engine.analyze_position(fen=chess.STARTING_FEN, time_ms=60000))
+        await asyncio.sleep(0.1)
+        abandoned.cancel()
+        result = await asyncio.wait_for(engine.analyze_position(fen=chess.STARTING_FEN, time_ms=50), timeout=10)
+        assert result["best_move"] is not None
+        assert not engine._inflight
+    finally:
+        if engine._ready:
+            await engine.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine_path", ENGINES)
+async def test_engine_pool_analyze_batch(engine_path: str) -> None:
+    """Test analyzing several positions in parallel with an engine pool."""
+    pool: UCIEnginePool = UCIEnginePool(engine_path, size=2)
+    try:
+        await pool.start()
+        board = chess.Board()
+        fens = [board.fen()]
+        for move_uci in ("e2e4", "e7e5", "g1f3"):
+            board.push_uci(move_uci)
+            fens.append(board.fen())
+
+        results = await pool.analyze_batch(fens, time_ms=50)
+        assert len(results) == len(fens)
+        for fen, analysis in zip(fens, results):
+            assert chess.Move.from_uci(analysis["best_move"]) in chess.Board(fen).legal_moves
+
+        results = await pool.analyze_batch(fens, depth=4)
+        assert len(results) == len(fens)
+        for fen, analysis in zip(fens, results):
+            assert chess.Move.from_uci(analysis["best_move"]) in chess.Board(fen).legal_moves
+
+        with pytest.raises(ValueError):
+            await pool.analyze_batch(fens, nodes=1000, depth=4)
+    finally:
+        await pool.stop()
+    assert not any(engine._ready for engine in pool.engines)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine_path", ENGINES)
+async def test_set_position_incremental(engine_path: str) -> None:
+    """Test that set_position follows extended and diverging move lists."""
+    engine: UCIEngine = UCIEngine(engine_path)
+    try:
+        await engine.start()
+        line = ["e2e4", "e7e5", "g1f3"]
+        await engine.set_position(moves=line)
+        await engine.set_position(moves=line + ["b8c6"])
+        expected = chess.Board()
+        for move_uci in line + ["b8c6"]:
+            expected.push_uci(move_uci)
+        assert engine._board == expected
+        assert engine._board.move_stack == expected.move_stack
+
+        # Diverge from the previous line after the first move
+        await engine.set_position(moves=["e2e4", "c7c5"])
+        expected = chess.Board()
+        expected.push_uci("e2e4")
+        expected.push_uci("c7c5")
+        assert engine._board.move_stack == expected.move_stack
+
+        best_move: str = await engine.get_best_move(time_ms=50)
+        assert chess.Move.from_uci(best_move) in expected.legal_moves
+
+        # An illegal move leaves the previous position in place
+        with pytest.raises(ValueError):
+            await engine.set_position(moves=["e2e4", "e7e5", "e2e4"])
+        assert engine._board.move_stack == expected.move_stack
+        with pytest.raises(ValueError):
+            await engine.set_position(fen="8/8/8/8/8/8/8/K1k5 w - - 0 1", moves=["e2e4"])
+        assert engine._board.move_stack == expected.move_stack
+        assert engine._board == expected
+    finally:
+        if engine._ready:
+            await engine.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine_path", ENGINES)
+async def test_analyze_game(engine_path: str) -> None:
+    """Test analyzing the positions of a game one move after the other."""
+    engine: UCIEngine = UCIEngine(engine_path)
+    try:
+        await engine.start()
+        moves = ["e2e4", "e7e5", "g1f3"]
+        results = await engine.analyze_game(moves=moves, time_ms=50)
+        assert len(results) == len(moves) + 1
+
+        board = chess.Board()
+        for move_uci, analysis in zip(moves + [None], results):
+            assert chess.Move.from_uci(analysis["best_move"]) in board.legal_moves
+            if move_uci:
+                board.push_uci(move_uci)
+
+        # Illegal moves are rejected before anything is analyzed
+        with pytest.raises(ValueError):
+            await engine.analyze_game(moves=["e2e4", "e2e4"], time_ms=50)
+
+        # Positions reached by repetition are searched with their history, not taken from the cache
+        repeating = ["g1f3", "g8f6", "f3g1", "f6g8"] * 2
+        engine._analysis_cache.clear()
+        searches = count_searches(engine)
+        results = await engine.analyze_game(moves=repeating, time_ms=50)
+        assert searches.await_count == len(repeating) + 1
+        assert len(engine._analysis_cache) == 1
+        assert await engine.analyze_position(fen=chess.STARTING_FEN, time_ms=50) == results[0]
+        assert searches.await_count == len(repeating) + 1
+    finally:
+        if engine._ready:
+            await engine.stop()